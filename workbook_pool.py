@@ -0,0 +1,308 @@
+import atexit
+import os
+import time
+from copy import copy
+from datetime import date
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# Status value marking a deleted row until the next flush compacts it away
+TOMBSTONE = "__deleted__"
+
+# (second, date string) of the last today_iso() call
+_today_cache = (None, "")
+
+# SharedWorkbook per absolute path, shared by every tracker in the process
+_WB_CACHE = {}
+
+
+class SharedWorkbook:
+    """An open workbook plus the bookkeeping every tracker on that file has to agree on.
+    
+    Row numbers, the index counter, the tombstone count, the dirty flag and the
+    search cache all describe the workbook's current contents, so they live here
+    rather than on a tracker, where another tracker's edits would make them stale.
+    """
+    
+    def __init__(self, wb):
+        self.wb = wb
+        self.dirty = False
+        self.row_by_index = None
+        # Row number of the last data row, tracked so appends never call ws.max_row
+        self.last_row = None
+        self.next_index = None
+        self.tombstones = 0
+        self.search_cache = None
+
+
+def get_workbook(path, mode="r"):
+    """Return the SharedWorkbook for path, opening the file on first use.
+
+    Args:
+        path: The .xlsx file to open
+        mode: "r" for reading, which is happy with any cached handle, or
+              "w" for writing, which upgrades a cached read-only handle
+    """
+    key = os.path.abspath(path)
+    shared = _WB_CACHE.get(key)
+    if shared is not None and (mode == "r" or not shared.wb.read_only):
+        return shared
+    if mode == "r":
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    else:
+        wb = openpyxl.load_workbook(path)
+    if shared is None:
+        shared = _WB_CACHE[key] = SharedWorkbook(wb)
+    else:
+        # A read-only handle never has pending edits, so its bookkeeping carries over
+        shared.wb.close()
+        shared.wb = wb
+    return shared
+
+
+def discard_workbook(path):
+    """Close and forget the shared workbook for path, e.g. before the file is rewritten."""
+    shared = _WB_CACHE.pop(os.path.abspath(path), None)
+    if shared is not None:
+        shared.wb.close()
+
+
+def atomic_save(path, save):
+    """Write a file through a temp file and swap it in, so a crash never leaves it half-written.
+
+    Args:
+        path: The file to replace
+        save: Callable that writes the complete new contents to the path it is given
+    """
+    tmp = path + ".tmp"
+    try:
+        save(tmp)
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def today_iso():
+    """Return today's date as YYYY-MM-DD, reusing the string within the same second."""
+    global _today_cache
+    now = int(time.time())
+    if _today_cache[0] != now:
+        _today_cache = (now, date.today().isoformat())
+    return _today_cache[1]
+
+
+def write_workbook(filename, title, headers, rows):
+    """Stream a bold header row and the given rows into a fresh write-only workbook."""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = Font(bold=True)
+        header_cells.append(cell)
+    ws.append(header_cells)
+    for row in rows:
+        ws.append(row)
+    wb.save(filename)
+
+
+class SheetTracker:
+    """Storage shared by the bug and test case trackers: one sheet, one row per item.
+    
+    Subclasses set title and headers. The first column holds the item index and
+    the "Status" column doubles as the tombstone marker for deleted rows. All
+    bookkeeping is kept on the file's SharedWorkbook, so several trackers on
+    the same file stay consistent.
+    """
+    
+    title = "Sheet"
+    headers = []
+    # Recreate the file when its header row does not match headers
+    check_headers = False
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self._status_col = self.headers.index("Status") + 1
+        self._headers_checked = not self.check_headers
+        atexit.register(self.flush)
+    
+    def _load_or_init(self):
+        """Return the SharedWorkbook, (re)creating the file first if it is missing or has unexpected headers."""
+        try:
+            shared = get_workbook(self.filename)
+            if self._headers_checked:
+                return shared
+            # Verify headers exist in the sheet
+            header_row = next(shared.wb.active.iter_rows(max_row=1, values_only=True), ())
+            if list(header_row[:len(self.headers)]) == self.headers:
+                self._headers_checked = True
+                return shared
+        except FileNotFoundError:
+            pass
+        self._initialize_workbook()
+        self._headers_checked = True
+        return get_workbook(self.filename)
+    
+    @property
+    def wb(self):
+        """The shared workbook for this file: opened read-only on first use, writable after the first mutation."""
+        return self._load_or_init().wb
+    
+    @property
+    def ws(self):
+        return self.wb.active
+    
+    def _write_ws(self):
+        """Return the SharedWorkbook with a writable workbook, promoting the read-only handle if needed."""
+        self._load_or_init()
+        shared = get_workbook(self.filename, "w")
+        shared.search_cache = None
+        if shared.row_by_index is None:
+            ws = shared.wb.active
+            shared.row_by_index = {}
+            shared.last_row = 1
+            for row_num, (index,) in enumerate(ws.iter_rows(min_row=2, max_col=1, values_only=True), 2):
+                # Older files can repeat an index; edits go to its first row, as they always did
+                shared.row_by_index.setdefault(index, row_num)
+                shared.last_row = row_num
+        return shared
+    
+    def _live_rows(self):
+        """Yield the values of every data row that has not been deleted."""
+        status = self._status_col - 1
+        for row in self.ws.iter_rows(min_row=2, values_only=True):
+            if row[status] != TOMBSTONE:
+                yield row
+    
+    def _compact(self):
+        """Delete tombstoned rows in place in a single pass.
+        
+        Each live row is copied, values and styles, up into the next free row,
+        and the leftover tail is removed with one delete_rows call, which
+        re-sorts the sheet's cells once rather than once per deleted run.
+        Working on the loaded workbook keeps other sheets and column widths.
+        """
+        shared = self._write_ws()
+        ws = shared.wb.active
+        status = self._status_col - 1
+        free_row = 2
+        for row_num, row in enumerate(ws.iter_rows(min_row=2, max_row=shared.last_row), 2):
+            if row[status].value == TOMBSTONE:
+                continue
+            if free_row != row_num:
+                for cell in row:
+                    target = ws.cell(row=free_row, column=cell.column)
+                    target.value = cell.value
+                    target._style = copy(cell._style)
+            free_row += 1
+        if free_row <= shared.last_row:
+            ws.delete_rows(free_row, shared.last_row - free_row + 1)
+        shared.row_by_index = None
+        shared.last_row = None
+        shared.tombstones = 0
+    
+    def flush(self):
+        """Save pending changes to disk, compacting away deleted rows if there are any."""
+        shared = _WB_CACHE.get(os.path.abspath(self.filename))
+        if shared is None or not shared.dirty:
+            return
+        if shared.tombstones:
+            self._compact()
+        atomic_save(self.filename, shared.wb.save)
+        shared.dirty = False
+    
+    def _initialize_workbook(self):
+        """Replace the file with an empty sheet holding only the header row."""
+        discard_workbook(self.filename)
+        atomic_save(self.filename, lambda tmp: write_workbook(tmp, self.title, self.headers, []))
+    
+    def _get_next_index(self):
+        """Hand out indices from a counter seeded once from the highest index in the sheet."""
+        shared = self._load_or_init()
+        if shared.next_index is None:
+            indices = shared.wb.active.iter_rows(min_row=2, max_col=1, values_only=True)
+            shared.next_index = max((row[0] or 0 for row in indices), default=0) + 1
+        index = shared.next_index
+        shared.next_index += 1
+        return index
+    
+    def _add_row(self, values):
+        """Append a row with a fresh index followed by values, and return the index."""
+        shared = self._write_ws()
+        ws = shared.wb.active
+        index = self._get_next_index()
+        ws.append([index, *values])
+        shared.last_row += 1
+        shared.row_by_index[index] = shared.last_row
+        shared.dirty = True
+        return index
+    
+    def _set_cells(self, index, values):
+        """Set the given {column number: value} cells on the row with the given index."""
+        shared = self._write_ws()
+        row_num = shared.row_by_index.get(index)
+        if row_num is None:
+            return
+        for column, value in values.items():
+            shared.wb.active.cell(row=row_num, column=column).value = value
+        shared.dirty = True
+    
+    def _delete_row(self, index):
+        """Tombstone the row with the given index; the next flush removes it."""
+        shared = self._write_ws()
+        row_num = shared.row_by_index.pop(index, None)
+        if row_num is None:
+            return
+        shared.wb.active.cell(row=row_num, column=self._status_col).value = TOMBSTONE
+        shared.tombstones += 1
+        shared.dirty = True
+    
+    def _search_index(self):
+        """Return the live rows and a prebuilt search structure, cached until the next mutation.
+        
+        With pyarrow this is one string array per column. Without it, it is one
+        lower-cased string per row with the cells joined by newlines, so a search
+        is a single substring test per row and a match cannot span two cells.
+        """
+        shared = self._load_or_init()
+        if shared.search_cache is None:
+            rows = list(self._live_rows())
+            if pa is not None:
+                index = [
+                    pa.array([None if value is None else str(value) for value in column], pa.string())
+                    for column in zip(*rows)
+                ]
+            else:
+                index = [
+                    "\n".join("" if value is None else str(value) for value in row).lower()
+                    for row in rows
+                ]
+            shared.search_cache = (rows, index)
+        return shared.search_cache
+    
+    def _search(self, keyword):
+        """Return the live rows with a cell containing keyword, ignoring case."""
+        rows, index = self._search_index()
+        if pa is not None:
+            if not rows:
+                return []
+            mask = None
+            for column in index:
+                matches = pc.match_substring(column, keyword, ignore_case=True)
+                mask = matches if mask is None else pc.or_kleene(mask, matches)
+            return [rows[i] for i in pc.indices_nonzero(pc.fill_null(mask, False)).to_pylist()]
+        
+        kw = keyword.lower()
+        return [row for row, haystack in zip(rows, index) if kw in haystack]